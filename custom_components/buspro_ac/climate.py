@@ -1,6 +1,9 @@
 """Climate platform for HDL AC Control."""
 
+import asyncio
 import logging
+import re
+import time
 import voluptuous as vol
 
 from homeassistant.components.climate import ClimateEntity, PLATFORM_SCHEMA
@@ -9,6 +12,7 @@ from homeassistant.components.climate.const import (
     ClimateEntityFeature,
 )
 from homeassistant.const import CONF_NAME, UnitOfTemperature, ATTR_TEMPERATURE
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 
 from .const import DOMAIN, CONF_DEVICES, CONF_ADDRESS
@@ -32,6 +36,46 @@ FAN_HIGH = "high"
 FAN_MEDIUM = "medium"
 FAN_LOW = "low"
 
+# Home Assistant <-> HDL value maps
+_FAN_MODE_MAP = {
+    FAN_AUTO: FAN_SPEED_AUTO,
+    FAN_HIGH: FAN_SPEED_HIGH,
+    FAN_MEDIUM: FAN_SPEED_MEDIUM,
+    FAN_LOW: FAN_SPEED_LOW,
+}
+_FAN_SPEED_REVERSE = {speed: mode for mode, speed in _FAN_MODE_MAP.items()}
+
+_HVAC_MODE_MAP = {
+    HVACMode.COOL: HVAC_MODE_COOL,
+    HVACMode.FAN_ONLY: HVAC_MODE_FAN,
+    HVACMode.DRY: HVAC_MODE_DRY,
+}
+# DRY is not offered in the UI, so DRY broadcasts map to COOL
+_HDL_MODE_REVERSE = {
+    HVAC_MODE_COOL: HVACMode.COOL,
+    HVAC_MODE_FAN: HVACMode.FAN_ONLY,
+    HVAC_MODE_DRY: HVACMode.COOL,
+}
+
+# Device address in "subnet.device" format (e.g., "1.14")
+_ADDR_RE = re.compile(r"^(\d+)\.(\d+)$")
+
+# Delay (seconds) before a command is sent so rapid changes collapse into one packet
+COMMAND_DEBOUNCE_DELAY = 0.1
+
+# Cooldown (seconds) after a status-driven state write; further changes in this
+# window (the rest of a 0x18/0x19/0x1A burst) are coalesced into one trailing write
+STATUS_DEBOUNCE_DELAY = 0.2
+
+# Window (seconds) in which repeating the pending command is not sent again
+COMMAND_REPEAT_WINDOW = 1.0
+
+# Backoff (seconds) between retries of a command whose send failed
+COMMAND_RETRY_DELAYS = (0.2, 0.4, 0.8)
+
+# Number of devices queried at once during the initial status sync
+INITIAL_STATUS_CONCURRENCY = 4
+
 # Climate platform schema
 DEVICE_SCHEMA = vol.Schema(
     {
@@ -49,7 +93,6 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 
 def setup_platform(hass, config, add_entities, discovery_info=None):
     """Set up HDL AC climate devices."""
-    import asyncio
     
     # Get gateways from hass.data
     if DOMAIN not in hass.data:
@@ -68,15 +111,14 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
         
         try:
             # Parse subnet.device
-            parts = address.split(".")
-            if len(parts) != 2:
+            match = _ADDR_RE.match(address)
+            if match is None:
                 _LOGGER.error(
                     f"Invalid address format '{address}'. Use 'subnet.device' (e.g., '1.14')"
                 )
                 continue
             
-            subnet = int(parts[0])
-            device_id = int(parts[1])
+            subnet, device_id = int(match.group(1)), int(match.group(2))
             
             # Get the correct gateway for this subnet
             if subnet in gateways:
@@ -102,7 +144,7 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
             continue
     
     if entities:
-        add_entities(entities, True)
+        add_entities(entities)
         
         # Request initial status for all ACs after entities are initialized
         async def request_initial_status():
@@ -112,34 +154,43 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
             
             _LOGGER.info(f"🔄 Starting initial status sync for {len(entities)} AC unit(s)...")
             
-            for entity in entities:
-                try:
-                    _LOGGER.info(f"📡 Requesting initial status for {entity.name} ({entity._subnet}.{entity._device_id})")
-                    
-                    # Build and send status request
-                    frame = build_status_request(
-                        entity._subnet,
-                        entity._device_id,
-                        entity._gateway.protocol_schema
-                    )
-                    
-                    # Send request twice with delay to ensure it's received
-                    entity._gateway.send_packet(frame)
-                    await asyncio.sleep(0.3)  # 300ms delay
-                    entity._gateway.send_packet(frame)  # Send again for reliability
-                    
-                    _LOGGER.debug(f"✅ Status request sent for {entity.name}")
-                    
-                    # Delay between different devices
-                    await asyncio.sleep(0.5)
-                    
-                except Exception as e:
-                    _LOGGER.error(f"❌ Failed to request status for {entity.name}: {e}")
+            # Query a few devices at a time so the bus isn't flooded
+            semaphore = asyncio.Semaphore(INITIAL_STATUS_CONCURRENCY)
+            
+            async def request_status(entity):
+                async with semaphore:
+                    try:
+                        _LOGGER.info(f"📡 Requesting initial status for {entity.name} ({entity._subnet}.{entity._device_id})")
+                        
+                        # Build and send status request
+                        frame = build_status_request(
+                            entity._subnet,
+                            entity._device_id,
+                            entity._protocol_schema
+                        )
+                        
+                        # Send request twice with delay to ensure it's received
+                        entity._send(frame)
+                        await asyncio.sleep(0.3)  # 300ms delay
+                        entity._send(frame)  # Send again for reliability
+                        
+                        _LOGGER.debug(f"✅ Status request sent for {entity.name}")
+                        
+                        # Delay before this slot is used for the next device
+                        await asyncio.sleep(0.5)
+                        
+                    except Exception as e:
+                        _LOGGER.error(f"❌ Failed to request status for {entity.name}: {e}")
+            
+            await asyncio.gather(*(request_status(entity) for entity in entities))
             
             _LOGGER.info(f"✅ Initial status sync complete - waiting for device responses...")
         
-        # Schedule the status request task (thread-safe)
-        asyncio.run_coroutine_threadsafe(request_initial_status(), hass.loop)
+        # Schedule the status request task (thread-safe); tracked so shutdown
+        # can cancel it while it is still sleeping between requests
+        tasks = hass.data[DOMAIN]["tasks"]
+        tasks[:] = [task for task in tasks if not task.done()]
+        tasks.append(asyncio.run_coroutine_threadsafe(request_initial_status(), hass.loop))
         
         return True
     
@@ -150,68 +201,90 @@ def setup_platform(hass, config, add_entities, discovery_info=None):
 class HdlAcClimate(ClimateEntity):
     """Representation of an HDL AC unit."""
 
+    # Static entity attributes, read directly by the ClimateEntity base properties
+    # Include OFF to show power button in Home Assistant UI
+    _attr_hvac_modes = [HVACMode.OFF, HVACMode.COOL, HVACMode.FAN_ONLY]
+    _attr_supported_features = (
+        ClimateEntityFeature.TARGET_TEMPERATURE
+        | ClimateEntityFeature.TURN_ON
+        | ClimateEntityFeature.TURN_OFF
+        | ClimateEntityFeature.FAN_MODE
+    )
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_fan_modes = [FAN_AUTO, FAN_HIGH, FAN_MEDIUM, FAN_LOW]
+
     def __init__(self, gateway, name: str, subnet: int, device_id: int):
         """Initialize the climate entity."""
         self._gateway = gateway
         self._name = name
         self._subnet = subnet
         self._device_id = device_id
-        self._hvac_mode = HVACMode.OFF
+        self._attr_name = name
+        self._attr_unique_id = f"hdl_ac_{subnet}_{device_id}"
+        self._attr_hvac_mode = HVACMode.OFF
         self._target_temperature = 24  # Default temperature
         self._current_temperature = None  # Actual room temperature from sensor
         self._fan_mode = FAN_AUTO  # Default fan mode
-        self._attr_temperature_unit = UnitOfTemperature.CELSIUS
         self._attr_min_temp = 18
         self._attr_max_temp = 30
         self._attr_target_temperature_step = 1
         
         # Optimistic update pattern: track command timing and last known device state
-        import time
-        self._last_command_sent = 0  # Timestamp when we sent a command from HA
-        self._last_status = {}  # Last status received from device
+        self._last_command_sent = float("-inf")  # Monotonic time of the last command sent from HA
+        self._last_status_key = None  # Fingerprint of the last status received from device
         self._pending_command = None  # What we're waiting to be confirmed
         
-        # Register callback for status updates
-        self._gateway.register_callback(subnet, device_id, self._handle_status_update)
+        # Frames are fixed for a given device and command, so build them once.
+        # The schema is loaded once per templates file and never changes at runtime.
+        self._protocol_schema = gateway.protocol_schema
+        self._off_frame = build_packet("off", subnet, device_id, self._protocol_schema)
+        self._on_frames = {}  # {(temperature, hvac_mode, fan_speed): frame}
+        self._send = gateway.send_packet  # Bound once, called per flush
+        
+        # Debounced command send: latest frame wins within the debounce window
+        self._queued_frame = None
+        self._flush_handle = None
+        self._send_attempts = 0  # Retries used for the queued frame
+        self._rollback_state = None  # (hvac_mode, temperature, fan_mode) before the command
+        
+        # Debounced state write for status broadcasts
+        self._state_write_handle = None
+        self._state_write_pending = False
         
         _LOGGER.info(f"Registered HDL AC: {name} (subnet={subnet}, device={device_id})")
 
-    @property
-    def name(self):
-        """Return the name of the climate device."""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique ID."""
-        return f"hdl_ac_{self._subnet}_{self._device_id}"
+    def _get_on_frame(self, temperature: int, hvac_mode: int, fan_speed: int) -> bytes:
+        """Return the ON frame for the given settings, building it on first use."""
+        key = (temperature, hvac_mode, fan_speed)
+        frame = self._on_frames.get(key)
+        if frame is None:
+            frame = build_packet(
+                "on",
+                self._subnet,
+                self._device_id,
+                self._protocol_schema,
+                temperature=temperature,
+                hvac_mode=hvac_mode,
+                fan_speed=fan_speed
+            )
+            self._on_frames[key] = frame
+        return frame
 
-    @property
-    def hvac_mode(self):
-        """Return current HVAC mode."""
-        return self._hvac_mode
+    async def async_added_to_hass(self):
+        """Register for status updates once the entity is added to Home Assistant."""
+        # Status callbacks are dispatched from the gateway listener on the event loop
+        self._gateway.register_callback(self._subnet, self._device_id, self._handle_status_update)
 
-    @property
-    def hvac_modes(self):
-        """Return the list of available HVAC modes."""
-        # Include OFF to show power button in Home Assistant UI
-        return [HVACMode.OFF, HVACMode.COOL, HVACMode.FAN_ONLY]
+    async def async_will_remove_from_hass(self):
+        """Unregister status updates when the entity is removed."""
+        self._gateway.unregister_callback(self._subnet, self._device_id, self._handle_status_update)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._state_write_handle is not None:
+            self._state_write_handle.cancel()
+            self._state_write_handle = None
 
-    @property
-    def supported_features(self):
-        """Return the list of supported features."""
-        return (
-            ClimateEntityFeature.TARGET_TEMPERATURE 
-            | ClimateEntityFeature.TURN_ON 
-            | ClimateEntityFeature.TURN_OFF
-            | ClimateEntityFeature.FAN_MODE
-        )
-    
-    @property
-    def temperature_unit(self):
-        """Return the unit of measurement."""
-        return self._attr_temperature_unit
-    
     @property
     def target_temperature(self):
         """Return the target temperature."""
@@ -222,98 +295,68 @@ class HdlAcClimate(ClimateEntity):
         """Return the current temperature (from AC sensor)."""
         return self._current_temperature
     
-    @property
-    def min_temp(self):
-        """Return the minimum temperature."""
-        return self._attr_min_temp
-    
-    @property
-    def max_temp(self):
-        """Return the maximum temperature."""
-        return self._attr_max_temp
-    
-    @property
-    def target_temperature_step(self):
-        """Return the supported step of target temperature."""
-        return self._attr_target_temperature_step
-    
     @property
     def fan_mode(self):
         """Return the current fan mode."""
         return self._fan_mode
-    
-    @property
-    def fan_modes(self):
-        """Return the list of available fan modes."""
-        return [FAN_AUTO, FAN_HIGH, FAN_MEDIUM, FAN_LOW]
 
-    def set_hvac_mode(self, hvac_mode):
+    async def async_set_hvac_mode(self, hvac_mode):
         """Set new target HVAC mode."""
+        # Nothing to send if the device is already in this mode
+        if hvac_mode == self._attr_hvac_mode and self._pending_command is None:
+            return
+        
         if hvac_mode == HVACMode.OFF:
             # Turn AC off
-            self.turn_off()
+            await self.async_turn_off()
         elif hvac_mode in [HVACMode.COOL, HVACMode.FAN_ONLY]:
+            prior_state = self._snapshot_state()
             # Store the desired mode
-            old_mode = self._hvac_mode
-            self._hvac_mode = hvac_mode
+            self._attr_hvac_mode = hvac_mode
             # If AC was already on (not OFF), apply the mode change immediately
             # If it was OFF, turn it on with the new mode
-            self.turn_on()
-            _LOGGER.info(f"Set HVAC mode to {hvac_mode} for {self._name}")
+            await self._async_turn_on(prior_state)
+            _LOGGER.info("Set HVAC mode to %s for %s", hvac_mode, self._name)
         else:
             _LOGGER.warning(f"Unsupported HVAC mode: {hvac_mode}")
     
-    def set_temperature(self, **kwargs):
+    async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
         
-        # Update target temperature
-        self._target_temperature = int(temperature)
+        # Nothing to send if the device already has this setpoint
+        temperature = int(temperature)
+        if temperature == self._target_temperature and self._pending_command is None:
+            return
         
         # If AC is currently on, send command with new temperature
-        if self._hvac_mode != HVACMode.OFF:
-            self.turn_on()
-        
-        self.schedule_update_ha_state()
+        # (turn_on writes the new state)
+        if self._attr_hvac_mode != HVACMode.OFF:
+            prior_state = self._snapshot_state()
+            self._target_temperature = temperature
+            await self._async_turn_on(prior_state)
+        else:
+            self._target_temperature = temperature
+            self.async_write_ha_state()
     
-    def set_fan_mode(self, fan_mode):
+    async def async_set_fan_mode(self, fan_mode):
         """Set new fan mode."""
-        import time
+        # Nothing to send if the device already uses this fan mode
+        if fan_mode == self._fan_mode and self._pending_command is None:
+            return
+        
         try:
-            # Map Home Assistant fan mode to HDL fan speed byte
-            fan_mode_map = {
-                FAN_AUTO: FAN_SPEED_AUTO,
-                FAN_HIGH: FAN_SPEED_HIGH,
-                FAN_MEDIUM: FAN_SPEED_MEDIUM,
-                FAN_LOW: FAN_SPEED_LOW,
-            }
-            
-            fan_speed_byte = fan_mode_map.get(fan_mode, FAN_SPEED_AUTO)
-            
-            # Map Home Assistant HVAC mode to HDL mode byte
-            hvac_mode_map = {
-                HVACMode.COOL: HVAC_MODE_COOL,
-                HVACMode.FAN_ONLY: HVAC_MODE_FAN,
-                HVACMode.DRY: HVAC_MODE_DRY,
-            }
-            
-            hdl_mode = hvac_mode_map.get(self._hvac_mode, HVAC_MODE_COOL)
+            # Map Home Assistant fan mode and HVAC mode to HDL bytes
+            fan_speed_byte = _FAN_MODE_MAP.get(fan_mode, FAN_SPEED_AUTO)
+            hdl_mode = _HVAC_MODE_MAP.get(self._attr_hvac_mode, HVAC_MODE_COOL)
             
             # Build packet with current temp/mode + new fan speed
-            frame = build_packet(
-                "on",
-                self._subnet,
-                self._device_id,
-                self._gateway.protocol_schema,
-                temperature=self._target_temperature,
-                hvac_mode=hdl_mode,
-                fan_speed=fan_speed_byte
-            )
+            frame = self._get_on_frame(self._target_temperature, hdl_mode, fan_speed_byte)
             
             # Optimistic update
-            self._last_command_sent = time.time()
+            self._last_command_sent = time.monotonic()
             self._pending_command = {
                 'is_on': True,
                 'temperature': self._target_temperature,
@@ -321,269 +364,358 @@ class HdlAcClimate(ClimateEntity):
                 'fan_speed': fan_speed_byte
             }
             
-            # Send via gateway
-            success = self._gateway.send_packet(frame)
+            # Queue for the debounced send
+            self._save_rollback_state(self._snapshot_state())
+            self._queue_frame(frame)
             
-            if success:
-                self._fan_mode = fan_mode
-                self.schedule_update_ha_state()
-                _LOGGER.info(
-                    f"Set fan mode: {self._name} (fan={fan_mode})"
-                )
-            else:
-                _LOGGER.error(f"Failed to set fan mode: {self._name}")
+            self._fan_mode = fan_mode
+            self.async_write_ha_state()
+            _LOGGER.info("Set fan mode: %s (fan=%s)", self._name, fan_mode)
                 
         except Exception as e:
             _LOGGER.error(f"Error setting fan mode {self._name}: {e}")
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn AC on with current mode and temperature."""
-        import time
+        await self._async_turn_on(self._snapshot_state())
+
+    async def _async_turn_on(self, prior_state: tuple):
+        """Turn AC on; prior_state is restored if the command can't be sent."""
         try:
-            # Map Home Assistant HVAC mode to HDL mode byte
-            hvac_mode_map = {
-                HVACMode.COOL: HVAC_MODE_COOL,
-                HVACMode.FAN_ONLY: HVAC_MODE_FAN,
-                HVACMode.DRY: HVAC_MODE_DRY,
-            }
+            # Turning on from OFF defaults to COOL
+            hvac_mode = self._attr_hvac_mode
+            if hvac_mode == HVACMode.OFF:
+                hvac_mode = HVACMode.COOL
             
             # Get HDL mode byte (default to COOL if not specified)
-            hdl_mode = hvac_mode_map.get(self._hvac_mode, HVAC_MODE_COOL)
+            hdl_mode = _HVAC_MODE_MAP.get(hvac_mode, HVAC_MODE_COOL)
             
             # Map fan mode to fan speed byte
-            fan_mode_map = {
-                FAN_AUTO: FAN_SPEED_AUTO,
-                FAN_HIGH: FAN_SPEED_HIGH,
-                FAN_MEDIUM: FAN_SPEED_MEDIUM,
-                FAN_LOW: FAN_SPEED_LOW,
-            }
-            fan_speed_byte = fan_mode_map.get(self._fan_mode, FAN_SPEED_AUTO)
+            fan_speed_byte = _FAN_MODE_MAP.get(self._fan_mode, FAN_SPEED_AUTO)
             
-            # Build ON packet with temperature, mode, and fan speed
-            frame = build_packet(
-                "on",
-                self._subnet,
-                self._device_id,
-                self._gateway.protocol_schema,
-                temperature=self._target_temperature,
-                hvac_mode=hdl_mode,
-                fan_speed=fan_speed_byte
-            )
-            
-            # Optimistic update: record what we're sending
-            self._last_command_sent = time.time()
-            self._pending_command = {
+            command = {
                 'is_on': True,
                 'temperature': self._target_temperature,
                 'hvac_mode': hdl_mode,
                 'fan_speed': fan_speed_byte
             }
+            now = time.monotonic()
+            if self._is_repeated_command(command, now):
+                return
             
-            # Send via gateway
-            success = self._gateway.send_packet(frame)
+            # Build ON packet with temperature, mode, and fan speed
+            frame = self._get_on_frame(self._target_temperature, hdl_mode, fan_speed_byte)
             
-            if success:
-                # Update state only if send was successful
-                if self._hvac_mode == HVACMode.OFF:
-                    self._hvac_mode = HVACMode.COOL  # Default to COOL when turning on
-                self.schedule_update_ha_state()
-                _LOGGER.info(
-                    f"Turned ON: {self._name} (mode={self._hvac_mode}, temp={self._target_temperature}°C)"
-                )
-            else:
-                _LOGGER.error(f"Failed to turn ON: {self._name}")
+            # Optimistic update: record what we're sending
+            self._attr_hvac_mode = hvac_mode
+            self._last_command_sent = now
+            self._pending_command = command
+            
+            # Queue for the debounced send
+            self._save_rollback_state(prior_state)
+            self._queue_frame(frame)
+            
+            self.async_write_ha_state()
+            _LOGGER.info(
+                "Turned ON: %s (mode=%s, temp=%s°C)",
+                self._name, self._attr_hvac_mode, self._target_temperature
+            )
                 
         except Exception as e:
             _LOGGER.error(f"Error turning ON {self._name}: {e}")
 
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn AC off."""
-        import time
         try:
-            # Build OFF packet
-            frame = build_packet(
-                "off",
-                self._subnet,
-                self._device_id,
-                self._gateway.protocol_schema
-            )
-            
-            # Optimistic update: record what we're sending (OFF command)
-            self._last_command_sent = time.time()
-            self._pending_command = {
+            command = {
                 'is_on': False,
                 'temperature': self._target_temperature,  # Preserve temperature
                 'hvac_mode': None
             }
+            now = time.monotonic()
+            if self._is_repeated_command(command, now):
+                return
             
-            # Send via gateway
-            success = self._gateway.send_packet(frame)
+            # Build OFF packet
+            frame = self._off_frame
             
-            if success:
-                self._hvac_mode = HVACMode.OFF
-                self.schedule_update_ha_state()
-                _LOGGER.info(f"Turned OFF: {self._name}")
-            else:
-                _LOGGER.error(f"Failed to turn OFF: {self._name}")
+            # Optimistic update: record what we're sending (OFF command)
+            self._last_command_sent = now
+            self._pending_command = command
+            
+            # Queue for the debounced send
+            self._save_rollback_state(self._snapshot_state())
+            self._queue_frame(frame)
+            
+            self._attr_hvac_mode = HVACMode.OFF
+            self.async_write_ha_state()
+            _LOGGER.info("Turned OFF: %s", self._name)
                 
         except Exception as e:
             _LOGGER.error(f"Error turning OFF {self._name}: {e}")
     
+    def _is_repeated_command(self, command: dict, now: float) -> bool:
+        """Return True if the same command is already pending and was issued just now."""
+        if (
+            command == self._pending_command
+            and now - self._last_command_sent < COMMAND_REPEAT_WINDOW
+        ):
+            _LOGGER.debug("Identical command already pending for %s (skipped)", self._name)
+            return True
+        return False
+    
+    def _queue_frame(self, frame: bytes):
+        """
+        Queue a frame for sending after the debounce window.
+        
+        Commands issued in quick succession (scenes, set_temperature with
+        hvac_mode) replace each other, so only the final state goes on the wire.
+        """
+        self._queued_frame = frame
+        self._send_attempts = 0
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = self.hass.loop.call_later(
+            COMMAND_DEBOUNCE_DELAY, self._flush_queued_frame
+        )
+    
+    @callback
+    def _flush_queued_frame(self):
+        """Send the most recently queued frame."""
+        frame = self._queued_frame
+        self._queued_frame = None
+        self._flush_handle = None
+        if frame is None:
+            return
+        
+        # The device's next broadcast must get through even if it repeats the
+        # state it reported before this command (e.g. the command was rejected)
+        self._last_status_key = None
+        
+        # Non-blocking UDP send, safe to call from the event loop
+        if self._send(frame):
+            self._send_attempts = 0
+            self._rollback_state = None
+            return
+        
+        # Retry with backoff unless a newer command replaces this frame
+        if self._send_attempts < len(COMMAND_RETRY_DELAYS):
+            delay = COMMAND_RETRY_DELAYS[self._send_attempts]
+            self._send_attempts += 1
+            _LOGGER.warning("Failed to send command: %s (retrying in %.1fs)", self._name, delay)
+            self._queued_frame = frame
+            self._flush_handle = self.hass.loop.call_later(delay, self._flush_queued_frame)
+            return
+        
+        # Give up: restore the state from before the command and let the
+        # device's next broadcast through immediately
+        _LOGGER.error("Failed to send command: %s", self._name)
+        self._send_attempts = 0
+        if self._rollback_state is not None:
+            self._attr_hvac_mode, self._target_temperature, self._fan_mode = self._rollback_state
+            self._rollback_state = None
+        self._pending_command = None
+        self._last_command_sent = float("-inf")
+        self.async_write_ha_state()
+    
+    def _snapshot_state(self) -> tuple:
+        """Return the (hvac_mode, temperature, fan_mode) shown right now."""
+        return (self._attr_hvac_mode, self._target_temperature, self._fan_mode)
+    
+    def _save_rollback_state(self, prior_state: tuple):
+        """
+        Remember the state to restore if the upcoming command can't be sent.
+        
+        Only called once a frame is actually queued, so a skipped command
+        never leaves a stale snapshot behind.
+        """
+        if self._rollback_state is None:
+            self._rollback_state = prior_state
+    
+    @callback
     def _handle_status_update(self, status: dict):
         """
         Handle status update from gateway broadcast using optimistic update pattern.
         
         Optimistic updates:
         - UI updates immediately when HA sends command (instant feedback)
-        - Ignore device status for 2-3s after sending command (device processing)
+        - Ignore device status for 2-3s after sending command (device processing),
+          unless the device already reports the commanded state
         - After window, accept whatever device reports as truth
         
         Args:
             status: Dictionary with 'is_on', 'temperature', 'hvac_mode' keys
         """
-        import time
         
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # OPTIMISTIC UPDATE WINDOW: Ignore device status for 2.5s after sending HA command
         # This gives device time to process and prevents fighting with our own commands
         command_window_active = (current_time - self._last_command_sent) < 2.5
         
-        if command_window_active:
+        if command_window_active and self._matches_pending_command(status):
+            # Device confirmed the command: close the window early
+            _LOGGER.debug("Command confirmed early for %s", self._name)
+            self._last_command_sent = float("-inf")
+        elif command_window_active:
             _LOGGER.debug(
-                f"⏭️ Ignoring status update during command window for {self._name} "
-                f"(sent {current_time - self._last_command_sent:.1f}s ago)"
+                "Ignoring status update during command window for %s (sent %.1fs ago)",
+                self._name, current_time - self._last_command_sent
             )
             return
         
         # DEBOUNCING: Ignore if this status is identical to the last one received
         # This prevents state flapping from rapid, duplicate broadcasts
-        if status == self._last_status:
-            _LOGGER.debug(f"🔄 Ignoring duplicate status for {self._name}")
+        status_key = (
+            status['is_on'],
+            status['temperature'],
+            status['current_temperature'],
+            status['hvac_mode'],
+            status['fan_speed'],
+        )
+        if status_key == self._last_status_key:
+            _LOGGER.debug("Ignoring duplicate status for %s", self._name)
             return
         
-        _LOGGER.info(f"🎯 Received status update for {self._name}: {status}")
+        _LOGGER.debug("Received status update for %s: %s", self._name, status)
         
         # Ignore DRY mode broadcasts since we removed it from UI
         if status['hvac_mode'] == HVAC_MODE_DRY:
-            _LOGGER.debug(f"Ignoring DRY mode broadcast for {self._name}")
+            _LOGGER.debug("Ignoring DRY mode broadcast for %s", self._name)
             # Still update last_status to prevent re-processing this packet
-            self._last_status = status.copy()
+            self._last_status_key = status_key
             return
         
         # Store as last known device state
-        self._last_status = status.copy()
+        self._last_status_key = status_key
         
         # Clear pending command (device has now reported state)
         if self._pending_command:
-            _LOGGER.debug(f"✅ Clearing pending command for {self._name}")
+            _LOGGER.debug("Clearing pending command for %s", self._name)
             self._pending_command = None
         
         # Apply the device status to HA state (device is source of truth)
         self._apply_status_update(status)
     
+    def _matches_pending_command(self, status: dict) -> bool:
+        """Return True if a status reports the state the pending command asked for."""
+        pending = self._pending_command
+        if pending is None:
+            return False
+        if not pending['is_on']:
+            return status['is_on'] is False
+        # Every field the ON command sets must be reported. 0x18 broadcasts
+        # carry no fan speed, so they can't confirm it and keep the window open.
+        return (
+            status['is_on'] is True
+            and status['temperature'] == pending['temperature']
+            and status['hvac_mode'] == pending['hvac_mode']
+            and status['fan_speed'] == pending['fan_speed']
+        )
+    
+    @callback
     def _apply_status_update(self, status: dict):
         """Apply the status update immediately, preserving temperature when going OFF."""
         try:
+            is_on = status['is_on']
+            temperature = status['temperature']
+            current_temperature = status['current_temperature']
+            hvac_mode = status['hvac_mode']
+            fan_speed = status['fan_speed']
+            
             updated = False
             changes = []
+            # Change descriptions are only built when they will be logged
+            log_changes = _LOGGER.isEnabledFor(logging.INFO)
             
-            # Update HVAC mode first (if available, regardless of is_on state)
-            if status['hvac_mode'] is not None:
-                # Map HDL mode to Home Assistant mode
-                if status['hvac_mode'] == HVAC_MODE_COOL:
-                    new_mode = HVACMode.COOL
-                elif status['hvac_mode'] == HVAC_MODE_FAN:
-                    new_mode = HVACMode.FAN_ONLY
-                elif status['hvac_mode'] == HVAC_MODE_DRY:
-                    # Map DRY to COOL since we removed DRY mode
-                    new_mode = HVACMode.COOL
-                    _LOGGER.debug(f"Mapping DRY mode to COOL for {self._name}")
-                else:
-                    new_mode = None  # Unknown mode
-                
-                # Update mode if we determined one AND it's different
-                if new_mode is not None:
-                    # Check if AC is on based on is_on flag
-                    if status['is_on'] is True:
-                        # AC is ON with a specific mode
-                        if self._hvac_mode != new_mode:
-                            old_mode = self._hvac_mode
-                            self._hvac_mode = new_mode
-                            updated = True
-                            changes.append(f"mode: {old_mode} → {new_mode}")
-                    elif status['is_on'] is False:
+            # Update HVAC mode first: explicit OFF wins, otherwise the reported
+            # mode applies (is_on None with a known mode means the AC is probably ON)
+            new_mode = _HDL_MODE_REVERSE.get(hvac_mode)
+            if is_on is False and (new_mode is not None or hvac_mode is None):
+                new_mode = HVACMode.OFF
+            
+            if new_mode is not None and self._attr_hvac_mode != new_mode:
+                old_mode = self._attr_hvac_mode
+                self._attr_hvac_mode = new_mode
+                updated = True
+                if log_changes:
+                    if new_mode == HVACMode.OFF:
                         # AC is OFF - preserve temperature
-                        if self._hvac_mode != HVACMode.OFF:
-                            old_mode = self._hvac_mode
-                            self._hvac_mode = HVACMode.OFF
-                            updated = True
-                            changes.append(f"mode: {old_mode} → OFF (temp preserved: {self._target_temperature}°C)")
+                        changes.append(f"mode: {old_mode} → OFF (temp preserved: {self._target_temperature}°C)")
                     else:
-                        # is_on is None but we have a mode - AC is probably ON
-                        # Apply the mode change regardless of current state
-                        if self._hvac_mode != new_mode:
-                            old_mode = self._hvac_mode
-                            self._hvac_mode = new_mode
-                            updated = True
-                            changes.append(f"mode: {old_mode} → {new_mode}")
-            elif status['is_on'] is False:
-                # No mode but explicitly OFF - preserve temperature
-                if self._hvac_mode != HVACMode.OFF:
-                    old_mode = self._hvac_mode
-                    self._hvac_mode = HVACMode.OFF
-                    updated = True
-                    changes.append(f"mode: {old_mode} → OFF (temp preserved: {self._target_temperature}°C)")
+                        changes.append(f"mode: {old_mode} → {new_mode}")
             
             # Update temperature ONLY if AC is ON or if temperature is explicitly provided
             # When AC is OFF, preserve the existing target temperature
-            if status['temperature'] is not None and status['is_on'] is not False:
-                if self._target_temperature != status['temperature']:
+            if temperature is not None and is_on is not False:
+                if self._target_temperature != temperature:
                     old_temp = self._target_temperature
-                    self._target_temperature = status['temperature']
+                    self._target_temperature = temperature
                     updated = True
-                    changes.append(f"temp: {old_temp}°C → {status['temperature']}°C")
-            elif status['temperature'] is not None and status['is_on'] is False:
+                    if log_changes:
+                        changes.append(f"temp: {old_temp}°C → {temperature}°C")
+            elif temperature is not None and is_on is False:
                 # AC is OFF but has temperature - log but don't update
                 _LOGGER.debug(
-                    f"AC is OFF, preserving target temp {self._target_temperature}°C "
-                    f"(device reported {status['temperature']}°C)"
+                    "AC is OFF, preserving target temp %s°C (device reported %s°C)",
+                    self._target_temperature, temperature
                 )
             
             # Update current temperature (sensor reading) - always update when available
-            if status.get('current_temperature') is not None:
-                if self._current_temperature != status['current_temperature']:
+            if current_temperature is not None:
+                if self._current_temperature != current_temperature:
                     old_current = self._current_temperature
-                    self._current_temperature = status['current_temperature']
+                    self._current_temperature = current_temperature
                     updated = True
-                    if old_current is not None:
-                        changes.append(f"current: {old_current}°C → {status['current_temperature']}°C")
-                    else:
-                        changes.append(f"current: {status['current_temperature']}°C")
+                    if log_changes:
+                        if old_current is not None:
+                            changes.append(f"current: {old_current}°C → {current_temperature}°C")
+                        else:
+                            changes.append(f"current: {current_temperature}°C")
             
             # Update fan mode if present in status
-            if status.get('fan_speed') is not None:
+            if fan_speed is not None:
                 # Map fan speed byte to Home Assistant fan mode
-                fan_speed_map_reverse = {
-                    FAN_SPEED_AUTO: FAN_AUTO,
-                    FAN_SPEED_HIGH: FAN_HIGH,
-                    FAN_SPEED_MEDIUM: FAN_MEDIUM,
-                    FAN_SPEED_LOW: FAN_LOW,
-                }
-                new_fan_mode = fan_speed_map_reverse.get(status['fan_speed'], FAN_AUTO)
+                new_fan_mode = _FAN_SPEED_REVERSE.get(fan_speed, FAN_AUTO)
                 if self._fan_mode != new_fan_mode:
                     old_fan = self._fan_mode
                     self._fan_mode = new_fan_mode
                     updated = True
-                    changes.append(f"fan: {old_fan} → {new_fan_mode}")
+                    if log_changes:
+                        changes.append(f"fan: {old_fan} → {new_fan_mode}")
             
             # If anything changed, update Home Assistant
             if updated:
-                _LOGGER.info(f"✅ {self._name} updated: {', '.join(changes)}")
-                self.schedule_update_ha_state()
+                if log_changes:
+                    _LOGGER.info("%s updated: %s", self._name, ", ".join(changes))
+                self._schedule_state_write()
             else:
-                _LOGGER.debug(f"No changes for {self._name} (already in sync)")
+                _LOGGER.debug("No changes for %s (already in sync)", self._name)
                 
         except Exception as e:
-            _LOGGER.error(f"Error handling status update for {self._name}: {e}", exc_info=True)
-
+            # Tracebacks only at debug level, so a bad packet stream can't flood the log
+            _LOGGER.warning("Error handling status update for %s: %r", self._name, e)
+            _LOGGER.debug("Status update traceback for %s", self._name, exc_info=True)
+    
+    def _schedule_state_write(self):
+        """
+        Write HA state for a status change, coalescing bursts.
+        
+        The first change is written immediately; changes during the following
+        cooldown are collapsed into one trailing write when it ends.
+        """
+        if self._state_write_handle is not None:
+            self._state_write_pending = True
+            return
+        self.async_write_ha_state()
+        self._state_write_handle = self.hass.loop.call_later(
+            STATUS_DEBOUNCE_DELAY, self._write_state
+        )
+    
+    @callback
+    def _write_state(self):
+        """Write any state changed during the cooldown to Home Assistant."""
+        self._state_write_handle = None
+        if self._state_write_pending:
+            self._state_write_pending = False
+            self.async_write_ha_state()
@@ -16,6 +16,14 @@ CONF_ADDRESS = "address"
 DEFAULT_GATEWAY_IP = "192.168.1.25"
 DEFAULT_GATEWAY_PORT = 6000
 
+# Socket tuning
+SEND_BUFFER_SIZE = 64 * 1024
+RECV_BUFFER_SIZE = 2048
+SOCKET_RCVBUF_SIZE = 1 << 20  # Kernel receive buffer for broadcast bursts
+
+# Maximum parsed statuses waiting for dispatch per listener
+STATUS_QUEUE_SIZE = 256
+
 # Templates file
 TEMPLATES_FILE = "templates.json"
 
@@ -0,0 +1,332 @@
+"""HDL gateway connection: UDP command sender and status broadcast listener."""
+
+import asyncio
+import logging
+import socket
+import threading
+
+from .const import (
+    RECV_BUFFER_SIZE,
+    SEND_BUFFER_SIZE,
+    SOCKET_RCVBUF_SIZE,
+    STATUS_QUEUE_SIZE,
+)
+from .hdl_ac_core import (
+    load_protocol,
+    parse_status_packet,
+    FRAME_MARKER,
+    MAX_FRAME_SIZE,
+    MIN_STATUS_FRAME_SIZE,
+    STATUS_PACKET_TYPES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HdlGateway:
+    """HDL Gateway connection handler: sends commands and dispatches status updates."""
+
+    def __init__(self, gateway_ip: str, gateway_port: int, templates_path: str):
+        """Initialize the gateway."""
+        self.gateway_ip = gateway_ip
+        self.gateway_port = gateway_port
+        self._callbacks = {}  # {(subnet, device_id): callback_function}
+        self._send_lock = threading.Lock()
+        
+        _LOGGER.info(
+            f"Initializing HDL Gateway: {gateway_ip}:{gateway_port}"
+        )
+        
+        # Load templates and discover protocol
+        try:
+            self.templates, self.protocol_schema = load_protocol(templates_path)
+            self.prefix = self.protocol_schema['prefix']
+            _LOGGER.info("Protocol discovery successful")
+        except Exception as e:
+            _LOGGER.error(f"Failed to load templates or discover protocol: {e}")
+            raise
+        
+        # Preallocated send buffer with the prefix written once; frames are
+        # copied into the tail on each send
+        self._prefix_len = len(self.prefix)
+        self._send_buf = bytearray(self._prefix_len + MAX_FRAME_SIZE)
+        self._send_buf[:self._prefix_len] = self.prefix
+        self._send_view = memoryview(self._send_buf)
+        
+        # Resolve a hostname once here (setup runs in the executor) so sends
+        # on the event loop never block on a DNS lookup
+        try:
+            self._gateway_addr = (socket.gethostbyname(gateway_ip), gateway_port)
+        except OSError as e:
+            _LOGGER.error(f"Failed to resolve gateway address {gateway_ip}: {e}")
+            raise
+        
+        # Long-lived UDP socket reused for every send. Left unconnected so setup
+        # doesn't depend on the network being up and the source address
+        # follows route/DHCP changes. Non-blocking so sends can run directly
+        # on the event loop.
+        self._send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._send_sock.setblocking(False)
+        self._send_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+    
+    def send_packet(self, frame: bytes) -> bool:
+        """
+        Send packet to gateway via UDP.
+        
+        Args:
+            frame: Frame bytes (starting with AA AA)
+            
+        Returns:
+            True if sent successfully, False on socket errors
+            
+        Raises:
+            ValueError: If the frame does not fit in a packet
+        """
+        if len(frame) > MAX_FRAME_SIZE:
+            raise ValueError(f"Frame too long ({len(frame)} bytes)")
+        
+        # Assemble complete packet (prefix + frame) in the send buffer
+        total_len = self._prefix_len + len(frame)
+        
+        # Send to the gateway on the shared socket
+        try:
+            with self._send_lock:
+                self._send_buf[self._prefix_len:total_len] = frame
+                self._send_sock.sendto(self._send_view[:total_len], self._gateway_addr)
+        except OSError as e:
+            _LOGGER.warning("Failed to send packet to %s:%s: %s", self.gateway_ip, self.gateway_port, e)
+            return False
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sent %d bytes to %s:%s", total_len, self.gateway_ip, self.gateway_port)
+        
+        return True
+    
+    def close(self):
+        """Close the gateway send socket."""
+        with self._send_lock:
+            try:
+                self._send_sock.close()
+            except OSError:
+                pass
+    
+    def register_callback(self, subnet: int, device_id: int, callback):
+        """
+        Register a callback for status updates from a specific device.
+        
+        Args:
+            subnet: Device subnet
+            device_id: Device ID
+            callback: Function to call with status dict
+        """
+        key = (subnet, device_id)
+        if key in self._callbacks:
+            _LOGGER.warning(f"Replacing existing callback for device {subnet}.{device_id}")
+        self._callbacks[key] = callback
+        _LOGGER.debug(f"Registered callback for device {subnet}.{device_id}")
+    
+    def unregister_callback(self, subnet: int, device_id: int, callback):
+        """
+        Unregister a callback for a specific device.
+        
+        Args:
+            subnet: Device subnet
+            device_id: Device ID
+            callback: Function to unregister
+        """
+        key = (subnet, device_id)
+        if self._callbacks.get(key) == callback:
+            del self._callbacks[key]
+            _LOGGER.debug(f"Unregistered callback for device {subnet}.{device_id}")
+    
+    def handle_status(self, status: dict):
+        """
+        Notify the callback registered for the device that reported a status.
+        
+        Args:
+            status: Parsed status dict from parse_status_packet()
+        """
+        subnet = status['subnet']
+        device_id = status['device_id']
+        
+        # Notify the registered callback
+        callback = self._callbacks.get((subnet, device_id))
+        
+        if callback is not None:
+            try:
+                callback(status)
+            except Exception as e:
+                _LOGGER.error("Error in status callback for %s.%s: %s", subnet, device_id, e)
+        else:
+            _LOGGER.info("Status update from unconfigured device %s.%s (ignored)", subnet, device_id)
+
+
+class HdlListener:
+    """
+    UDP listener for HDL status broadcasts on one port.
+    
+    A single socket is shared by all gateways on the same port, so each
+    broadcast is received and parsed once, then handed to the gateway
+    that serves the reporting device's subnet.
+    
+    Parsed statuses go through a bounded queue drained by a dispatch task,
+    so receiving is never held up by entity state updates.
+    """
+
+    def __init__(self, port: int, prefix_len: int):
+        """
+        Initialize the listener.
+        
+        Args:
+            port: UDP port to bind
+            prefix_len: Length of the packet prefix before the AA AA marker
+        """
+        self.port = port
+        self._sock = None
+        self._loop = None
+        self._gateways = {}  # {subnet or None: HdlGateway}
+        self._queue = None
+        self._dispatch_task = None
+        
+        # Broadcasts use the same fixed-size prefix (source IP + "HDLMIRACLE"),
+        # so the frame marker and type byte sit at known offsets
+        self._prefix_len = prefix_len
+        self._status_type_offset = prefix_len + len(FRAME_MARKER)
+        self._min_status_len = prefix_len + MIN_STATUS_FRAME_SIZE
+        
+        # Reusable receive buffer: datagrams are read into it and parsed in place
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buf)
+    
+    def add_gateway(self, subnet, gateway: HdlGateway):
+        """
+        Route status broadcasts for a subnet to a gateway.
+        
+        Args:
+            subnet: Subnet served by the gateway, or None for all subnets
+            gateway: Gateway receiving the status updates
+        """
+        self._gateways[subnet] = gateway
+    
+    async def async_start(self, loop):
+        """Start receiving status broadcasts on the event loop."""
+        if self._sock is not None:
+            _LOGGER.warning("Listener already running")
+            return
+        
+        sock = None
+        try:
+            # Create non-blocking UDP socket for receiving broadcasts
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Larger kernel buffer so bursts of broadcasts aren't dropped
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_SIZE)
+            sock.setblocking(False)
+            
+            # Bind to all interfaces on the listener port
+            sock.bind(('0.0.0.0', self.port))
+        except OSError as e:
+            _LOGGER.error(f"Failed to start UDP listener: {e}")
+            if sock is not None:
+                sock.close()
+            return
+        
+        self._sock = sock
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=STATUS_QUEUE_SIZE)
+        self._dispatch_task = loop.create_task(self._async_dispatch_loop())
+        loop.add_reader(sock.fileno(), self._read_ready)
+        
+        _LOGGER.info(f"Listening for HDL broadcasts on 0.0.0.0:{self.port}")
+    
+    def stop(self):
+        """Stop the UDP listener."""
+        if self._sock is None:
+            return
+        
+        _LOGGER.info("Stopping UDP listener...")
+        self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self._dispatch_task.cancel()
+        self._dispatch_task = None
+        _LOGGER.info("UDP listener stopped")
+    
+    def _read_ready(self):
+        """Receive one datagram into the reusable buffer and handle it."""
+        try:
+            n, addr = self._sock.recvfrom_into(self._recv_buf)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            _LOGGER.debug("UDP listener error: %s", e)
+            return
+        
+        try:
+            self._handle_datagram(self._recv_view[:n], addr)
+        except Exception as e:
+            _LOGGER.warning("Error handling datagram: %r", e)
+            _LOGGER.debug("Datagram handling traceback", exc_info=True)
+    
+    def _handle_datagram(self, data: memoryview, addr):
+        """
+        Parse a received datagram and pass it to the gateway for its subnet.
+        
+        Args:
+            data: View into the receive buffer, only valid until the next receive
+            addr: Sender (ip, port)
+        """
+        # Fast reject: anything that cannot be a status broadcast skips the parser
+        if (
+            len(data) < self._min_status_len
+            or data[self._prefix_len:self._status_type_offset] != FRAME_MARKER
+            or data[self._status_type_offset] not in STATUS_PACKET_TYPES
+        ):
+            _LOGGER.debug("Ignoring non-status packet")
+            return
+        
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        
+        # Log received packet
+        if debug:
+            _LOGGER.debug("Packet received: %d bytes from %s:%d", len(data), addr[0], addr[1])
+        
+        # Parse status packet; the marker was already found at the end of the prefix
+        status = parse_status_packet(data, None, self._prefix_len)
+        
+        if not status:
+            _LOGGER.debug("Received packet could not be parsed as status update")
+            return
+        
+        if debug:
+            _LOGGER.debug(
+                "Parsed status for %s.%s: on=%s, temp=%s, mode=%s",
+                status['subnet'], status['device_id'],
+                status['is_on'], status['temperature'], status['hvac_mode'],
+            )
+        
+        # Hand off to the dispatch task; when full, drop the oldest status
+        # (the device will broadcast again, as with any lost datagram)
+        try:
+            self._queue.put_nowait(status)
+        except asyncio.QueueFull:
+            self._queue.get_nowait()
+            self._queue.put_nowait(status)
+            _LOGGER.debug("Status queue full, dropped oldest status")
+    
+    async def _async_dispatch_loop(self):
+        """Pass queued statuses to the gateway serving each device's subnet."""
+        while True:
+            status = await self._queue.get()
+            
+            # Route to the subnet's gateway, falling back to the default gateway
+            gateway = self._gateways.get(status['subnet']) or self._gateways.get(None)
+            if gateway is None:
+                _LOGGER.debug("No gateway for subnet %s (ignored)", status['subnet'])
+                continue
+            
+            try:
+                gateway.handle_status(status)
+            except Exception as e:
+                _LOGGER.warning("Error dispatching status: %r", e)
+                _LOGGER.debug("Status dispatch traceback", exc_info=True)
@@ -10,6 +10,10 @@ Uses exact HDL Pascal CRC-16 CCITT algorithm (polynomial 0x1021).
 import json
 import binascii
 import logging
+import os
+import re
+import struct
+from functools import lru_cache
 from typing import Tuple, Dict, List
 from pathlib import Path
 
@@ -32,6 +36,13 @@ FAN_SPEED_HIGH = 0x01
 FAN_SPEED_MEDIUM = 0x02
 FAN_SPEED_LOW = 0x03
 
+# ============================================================================
+# Frame Size Constants
+# ============================================================================
+
+# AA AA marker + length byte range (length byte counts itself and the data area)
+MAX_FRAME_SIZE = 2 + 0xFF
+
 # ============================================================================
 # CRC-16 CCITT HDL Pascal Implementation
 # ============================================================================
@@ -53,6 +64,9 @@ def generate_crc_table() -> List[int]:
 
 CRC_TABLE = generate_crc_table()
 
+# CRC is stored big-endian: [CRCHi, CRCLo]
+_CRC_FIELD = struct.Struct(">H")
+
 
 def compute_hdl_crc(data_with_length: bytes) -> Tuple[int, int, int]:
     """
@@ -65,15 +79,9 @@ def compute_hdl_crc(data_with_length: bytes) -> Tuple[int, int, int]:
     Returns:
         (crc_hi, crc_lo, crc_16bit)
     """
-    crc = 0x0000
-    # Process everything except the last 2 CRC bytes
-    data_len = len(data_with_length) - 2
-    
-    for i in range(data_len):
-        byte = data_with_length[i]
-        idx = ((crc >> 8) ^ byte) & 0xFF
-        crc = ((crc << 8) & 0xFFFF) ^ CRC_TABLE[idx]
-        crc &= 0xFFFF
+    # binascii.crc_hqx is the same CRC-16 CCITT (poly 0x1021, init 0) as
+    # CRC_TABLE, computed in C. Process everything except the last 2 CRC bytes.
+    crc = binascii.crc_hqx(memoryview(data_with_length)[:-2], 0)
     
     crc_hi = (crc >> 8) & 0xFF
     crc_lo = crc & 0xFF
@@ -88,10 +96,10 @@ def append_hdl_crc(length_and_data: bytearray) -> None:
     
     Args:
         length_and_data: [Length byte] + [Data bytes] with 2 trailing CRC positions
+                         (bytearray or writable memoryview)
     """
-    crc_hi, crc_lo, _ = compute_hdl_crc(length_and_data)
-    length_and_data[-2] = crc_hi
-    length_and_data[-1] = crc_lo
+    _, _, crc = compute_hdl_crc(length_and_data)
+    _CRC_FIELD.pack_into(length_and_data, len(length_and_data) - 2, crc)
 
 
 # ============================================================================
@@ -329,6 +337,25 @@ def discover_protocol(templates: Dict[str, str], silent: bool = False) -> Dict:
 # Packet Builder
 # ============================================================================
 
+def _finalize_frame(frame: bytearray) -> bytes:
+    """
+    Update length byte and CRC of a frame in place and return it as bytes.
+    
+    The CRC is computed and written through a memoryview, so the
+    length + data area is not copied out and back.
+    
+    Args:
+        frame: Mutable frame (AA AA + length byte + data area with 2 CRC bytes)
+    """
+    # Update length byte (length includes itself, data area follows it)
+    frame[2] = len(frame) - 2
+    
+    # Recompute and write CRC (includes length byte)
+    append_hdl_crc(memoryview(frame)[2:])
+    
+    return bytes(frame)
+
+
 def build_status_request(subnet: int, device: int, schema: Dict) -> bytes:
     """
     Build a status request packet for given device address.
@@ -354,20 +381,7 @@ def build_status_request(subnet: int, device: int, schema: Dict) -> bytes:
     frame[data_area_offset + 6] = subnet
     frame[data_area_offset + 7] = device
     
-    # Extract data area for CRC calculation
-    data_area = frame[data_area_offset:]
-    
-    # Update length byte (length includes itself!)
-    frame[2] = len(data_area) + 1
-    
-    # Recompute and append CRC (includes length byte)
-    length_and_data = bytearray(frame[2:])
-    append_hdl_crc(length_and_data)
-    
-    # Write back length byte + data area with new CRC
-    frame[2:] = length_and_data
-    
-    return bytes(frame)
+    return _finalize_frame(frame)
 
 
 def build_packet(verb: str, subnet: int, device: int, schema: Dict, 
@@ -439,27 +453,54 @@ def build_packet(verb: str, subnet: int, device: int, schema: Dict,
         fan_pos = schema['fan_speed_position']
         frame[data_area_offset + fan_pos] = fan_speed
     
-    # Extract data area
-    data_area = frame[data_area_offset:]
-    
-    # Update length byte (length includes itself!)
-    frame[2] = len(data_area) + 1
-    
-    # Recompute and append CRC (includes length byte)
-    length_and_data = bytearray(frame[2:])
-    append_hdl_crc(length_and_data)
-    
-    # Write back length byte + data area with new CRC
-    frame[2:] = length_and_data
-    
-    return bytes(frame)
+    return _finalize_frame(frame)
 
 
 # ============================================================================
-# Template Loading
+# Status Packet Parsing
 # ============================================================================
 
-def parse_status_packet(packet: bytes, schema: Dict) -> Dict:
+FRAME_MARKER = b'\xaa\xaa'
+
+# Regex search works on any buffer (bytes, bytearray, memoryview) without copying
+_FRAME_MARKER_RE = re.compile(re.escape(FRAME_MARKER))
+
+# Fixed field layouts of the status data area (after AA AA and length byte),
+# keyed by length byte. Unused bytes are skipped with pad ('x') codes.
+_STATUS_LAYOUT_18_1A = struct.Struct(
+    "BB"    # 0-1:  subnet, device_id
+    "8x"    # 2-9
+    "B"     # 10:   current room temperature
+    "B"     # 11:   target setpoint temperature
+    "3x"    # 12-14
+    "B"     # 15:   ON/OFF indicator
+    "B"     # 16:   fan speed (0x1A only)
+    "B"     # 17:   HVAC mode
+)
+_STATUS_LAYOUT_19 = struct.Struct(
+    "BB"    # 0-1:  subnet, device_id
+    "7x"    # 2-8
+    "B"     # 9:    ON/OFF indicator
+    "B"     # 10:   target setpoint temperature
+    "5x"    # 11-15
+    "B"     # 16:   fan speed
+    "B"     # 17:   HVAC mode
+)
+_STATUS_LAYOUTS = {
+    0x18: _STATUS_LAYOUT_18_1A,
+    0x19: _STATUS_LAYOUT_19,
+    0x1A: _STATUS_LAYOUT_18_1A,
+}
+
+# Length bytes of the status broadcasts we understand, and the smallest such frame
+STATUS_PACKET_TYPES = frozenset(_STATUS_LAYOUTS)
+MIN_STATUS_FRAME_SIZE = 2 + min(STATUS_PACKET_TYPES)
+
+_HVAC_MODES = frozenset((HVAC_MODE_COOL, HVAC_MODE_FAN, HVAC_MODE_DRY))
+_FAN_SPEEDS = frozenset((FAN_SPEED_AUTO, FAN_SPEED_HIGH, FAN_SPEED_MEDIUM, FAN_SPEED_LOW))
+
+
+def parse_status_packet(packet: bytes, schema: Dict, frame_offset: int = None) -> Dict:
     """
     Parse incoming status packet from HDL gateway broadcast.
     
@@ -489,8 +530,11 @@ def parse_status_packet(packet: bytes, schema: Dict) -> Dict:
     Position 17:   HVAC mode (0x00=COOL, 0x02=FAN, 0x04=DRY)
     
     Args:
-        packet: Complete packet bytes (may include prefix + frame)
+        packet: Complete packet (may include prefix + frame); any bytes-like
+                object, including a memoryview into a receive buffer
         schema: protocol schema from discover_protocol()
+        frame_offset: Position of the AA AA marker when the caller already
+                      knows it (fixed-size prefix); searched for otherwise
         
     Returns:
         Dictionary with: {
@@ -504,152 +548,88 @@ def parse_status_packet(packet: bytes, schema: Dict) -> Dict:
         }
         Returns None if packet is not a valid Type 0x18, 0x19, or 0x1A status packet
     """
-    import binascii
-    
     try:
-        _LOGGER.debug(f"📦 Parsing packet: {len(packet)} bytes - {binascii.hexlify(packet).decode()}")
-        
-        # Find AA AA marker to extract frame
-        aa_pos = -1
-        for i in range(len(packet) - 1):
-            if packet[i] == 0xAA and packet[i + 1] == 0xAA:
-                aa_pos = i
-                break
-        
-        if aa_pos < 0:
-            _LOGGER.debug(f"No AA AA marker found, skipping packet")
-            return None
-        
-        frame = packet[aa_pos:]
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Parsing packet: %d bytes - %s", len(packet), binascii.hexlify(packet).decode())
+        
+        if frame_offset is None:
+            # Find AA AA marker to extract frame
+            marker = _FRAME_MARKER_RE.search(packet)
+            
+            if marker is None:
+                _LOGGER.debug("No AA AA marker found, skipping packet")
+                return None
+            
+            aa_pos = marker.start()
+        else:
+            aa_pos = frame_offset
+        frame_len = len(packet) - aa_pos
         
         # Validate frame basics
-        if len(frame) < 10:
-            _LOGGER.debug(f"Frame too short: {len(frame)} bytes")
+        if frame_len < 10:
+            _LOGGER.debug("Frame too short: %d bytes", frame_len)
             return None
         
-        if frame[0] != 0xAA or frame[1] != 0xAA:
-            _LOGGER.debug(f"Frame doesn't start with AA AA")
-            return None
-        
-        length = frame[2]
+        length = packet[aa_pos + 2]
         
         # ⭐ Process Type 0x18 (temperature/mode), 0x19 (extended status), and Type 0x1A (fan speed) broadcasts
-        if length not in [0x18, 0x19, 0x1A]:
-            _LOGGER.debug(f"Ignoring non-0x18/0x19/0x1A packet (length={length:#04x})")
+        layout = _STATUS_LAYOUTS.get(length)
+        if layout is None:
+            _LOGGER.debug("Ignoring non-0x18/0x19/0x1A packet (length=%#04x)", length)
             return None
         
         # Validate frame length matches
         expected_data_len = length - 1
-        actual_data_len = len(frame) - 3
+        actual_data_len = frame_len - 3
         
         if actual_data_len != expected_data_len:
-            _LOGGER.debug(f"Length mismatch: expected {expected_data_len}, got {actual_data_len}")
+            _LOGGER.debug("Length mismatch: expected %d, got %d", expected_data_len, actual_data_len)
             return None
         
-        # Extract data area (skip AA AA and length byte, exclude 2 CRC bytes at end)
-        data_area = frame[3:-2]
-        
-        # Validate data area has enough bytes for fixed positions
-        min_bytes_needed = 18 if length == 0x18 else 18  # Both need at least 18 bytes
-        if len(data_area) < min_bytes_needed:
-            _LOGGER.debug(f"Data area too short: {len(data_area)} bytes (need at least {min_bytes_needed})")
-            return None
+        # Data area: skip AA AA and length byte, exclude 2 CRC bytes at end.
+        # All status types carry 22+ data bytes, so the fixed layout always fits.
+        data_offset = aa_pos + 3
         
         # ═══════════════════════════════════════════════════════════════
         # FIXED POSITION PARSING - No scanning, no guessing!
         # ═══════════════════════════════════════════════════════════════
         
-        # Position 0-1: Device address
-        subnet = data_area[0]
-        device_id = data_area[1]
-        
-        # Temperature position varies by packet type:
-        # - Type 0x18: position 11
-        # - Type 0x19: position 10
-        # - Type 0x1A: position 11
         if length == 0x19:
-            temp_byte = data_area[10] if len(data_area) > 10 else None
+            (subnet, device_id, on_off_byte, temp_byte,
+             fan_speed_byte, mode_byte) = layout.unpack_from(packet, data_offset)
+            # Type 0x19 has no separate sensor reading; position 10 doubles as current
+            current_temp_byte = temp_byte
+            is_on = (on_off_byte == 0x01)
         else:
-            temp_byte = data_area[11] if len(data_area) > 11 else None
+            (subnet, device_id, current_temp_byte, temp_byte,
+             on_off_byte, fan_speed_byte, mode_byte) = layout.unpack_from(packet, data_offset)
+            is_on = (on_off_byte != 0x20)
         
         # Validate temperature range (16-35°C typical for AC setpoints)
-        if temp_byte is not None and 16 <= temp_byte <= 35:
-            temperature = temp_byte
-        else:
-            temperature = None  # Invalid range or not applicable
-        
-        # Current room temperature (sensor reading) - typically at position 10
-        # This is the actual measured temperature, not the setpoint
-        current_temp_byte = data_area[10] if len(data_area) > 10 else None
-        
-        # Exploratory logging to help identify current temp position
-        if len(data_area) > 13:
-            _LOGGER.debug(
-                f"  🔍 Temp exploration: Pos10=0x{data_area[10]:02x}({data_area[10]}°C), "
-                f"Pos11=0x{data_area[11]:02x}({data_area[11]}°C), "
-                f"Pos12=0x{data_area[12]:02x}({data_area[12]}°C), "
-                f"Pos13=0x{data_area[13]:02x}({data_area[13]}°C)"
-            )
+        temperature = temp_byte if 16 <= temp_byte <= 35 else None
         
         # Validate current temperature range (10-50°C wider range for actual readings)
-        if current_temp_byte is not None and 10 <= current_temp_byte <= 50:
-            current_temperature = current_temp_byte
-        else:
-            current_temperature = None  # Invalid range or not applicable
-        
-        # ON/OFF position varies by packet type:
-        # - Type 0x18: position 15 (0x20=OFF, 0x01=ON COOL, 0x21=ON FAN)
-        # - Type 0x19: position 9 (0x00=OFF, 0x01=ON)
-        # - Type 0x1A: position 15 (0x20=OFF, 0x01=ON COOL, 0x21=ON FAN)
-        if length == 0x19:
-            on_off_byte = data_area[9] if len(data_area) > 9 else 0x00
-            is_on = (on_off_byte == 0x01)
-        else:
-            on_off_byte = data_area[15]
-            is_on = (on_off_byte != 0x20)
-        
-        # Position 17: HVAC mode
-        # 0x00 = COOL mode
-        # 0x02 = FAN mode
-        # 0x04 = DRY mode
-        mode_byte = data_area[17]
+        current_temperature = current_temp_byte if 10 <= current_temp_byte <= 50 else None
         
         # Map to standard HVAC mode constants
-        if mode_byte == 0x00:
-            hvac_mode = HVAC_MODE_COOL
-        elif mode_byte == 0x02:
-            hvac_mode = HVAC_MODE_FAN
-        elif mode_byte == 0x04:
-            hvac_mode = HVAC_MODE_DRY
-        else:
-            hvac_mode = None
+        hvac_mode = mode_byte if mode_byte in _HVAC_MODES else None
         
-        # Position 16: Fan speed (in 0x19 and 0x1A packets)
-        # 0x00 = AUTO
-        # 0x01 = HIGH
-        # 0x02 = MEDIUM
-        # 0x03 = LOW
+        # Fan speed is only reported in 0x19 and 0x1A packets
         fan_speed = None
-        if length in [0x19, 0x1A] and len(data_area) > 16:
-            fan_speed_byte = data_area[16]
-            if fan_speed_byte in [0x00, 0x01, 0x02, 0x03]:
-                fan_speed = fan_speed_byte
+        if length != 0x18 and fan_speed_byte in _FAN_SPEEDS:
+            fan_speed = fan_speed_byte
         
         # ═══════════════════════════════════════════════════════════════
         # END FIXED POSITION PARSING
         # ═══════════════════════════════════════════════════════════════
         
-        mode_str = f"0x{hvac_mode:02x}" if hvac_mode is not None else "None"
-        fan_str = f"0x{fan_speed:02x}" if fan_speed is not None else "None"
-        packet_type = f"0x{length:02x}"
-        
-        _LOGGER.debug(
-            f"✓ Parsed Type {packet_type} packet: {subnet}.{device_id} | "
-            f"ON={is_on} | Current={current_temperature}°C | Target={temperature}°C | Mode={mode_str} | Fan={fan_str}"
-        )
-        _LOGGER.debug(f"  Position 10 (Current): 0x{current_temp_byte:02x}, Position 11 (Target): 0x{temp_byte:02x}, Position 15 (ON/OFF): 0x{on_off_byte:02x}, Position 17 (Mode): 0x{mode_byte:02x}")
-        if fan_speed is not None:
-            _LOGGER.debug(f"  Position 16 (Fan): 0x{fan_speed:02x}")
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            mode_str = f"0x{hvac_mode:02x}" if hvac_mode is not None else "None"
+            fan_str = f"0x{fan_speed:02x}" if fan_speed is not None else "None"
+            _LOGGER.debug(
+                "Parsed Type %#04x packet: %s.%s | ON=%s | Current=%s°C | Target=%s°C | Mode=%s | Fan=%s",
+                length, subnet, device_id, is_on, current_temperature, temperature, mode_str, fan_str
+            )
         
         return {
             'subnet': subnet,
@@ -662,10 +642,14 @@ def parse_status_packet(packet: bytes, schema: Dict) -> Dict:
         }
         
     except Exception as e:
-        _LOGGER.debug(f"Failed to parse status packet: {e}", exc_info=True)
+        _LOGGER.debug("Failed to parse status packet: %s", e, exc_info=True)
         return None
 
 
+# ============================================================================
+# Template Loading
+# ============================================================================
+
 def load_templates(templates_path: str) -> Dict[str, str]:
     """
     Load templates from JSON file.
@@ -686,3 +670,32 @@ def load_templates(templates_path: str) -> Dict[str, str]:
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in templates file: {e}")
 
+
+@lru_cache(maxsize=4)
+def _load_protocol_cached(templates_path: str, mtime_ns: int) -> Tuple[Dict[str, str], Dict]:
+    """Load templates and discover the protocol for one version of the file."""
+    templates = load_templates(templates_path)
+    return templates, discover_protocol(templates, silent=True)
+
+
+def load_protocol(templates_path: str) -> Tuple[Dict[str, str], Dict]:
+    """
+    Load templates and discover the protocol schema, cached per templates file.
+    
+    Every gateway uses the same templates file, so the JSON parse and
+    discovery run once no matter how many gateways are configured or how
+    often the integration is reloaded. The cache is keyed on the file's
+    modification time, so an edited templates file is picked up again.
+    The returned objects are shared and must not be modified.
+    
+    Args:
+        templates_path: Path to templates.json file
+        
+    Returns:
+        (templates, protocol_schema)
+    """
+    try:
+        mtime_ns = os.stat(templates_path).st_mtime_ns
+    except FileNotFoundError:
+        raise ValueError(f"Templates file not found: {templates_path}")
+    return _load_protocol_cached(str(templates_path), mtime_ns)